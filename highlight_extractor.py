@@ -5,9 +5,15 @@ Extracts highlighted text from PDF files and saves to markdown, docx, or txt for
 """
 
 import argparse
+import multiprocessing
+import os
 import re
 import sys
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import deepcopy
 from pathlib import Path
+from typing import Optional
 
 try:
     import fitz  # PyMuPDF
@@ -16,88 +22,206 @@ except ImportError:
     sys.exit(1)
 
 
-def extract_highlights(pdf_path: str) -> list[dict]:
+# Control characters dropped by clean_text(); tab and newline are kept here
+# because _TRANSLATE maps them to spaces instead (\r is simply dropped)
+_CONTROL_STRIP = {i: None for i in range(32) if i not in (9, 10)}
+
+# Common PDF ligatures and their expanded forms
+_LIGATURES = {
+    "\ufb00": "ff",  # ff ligature
+    "\ufb01": "fi",  # fi ligature
+    "\ufb02": "fl",  # fl ligature
+    "\ufb03": "ffi", # ffi ligature
+    "\ufb04": "ffl", # ffl ligature
+    "\ufb05": "st",  # st ligature (long s)
+    "\ufb06": "st",  # st ligature
+}
+
+# Character table for clean_text(): expands ligatures, maps tabs and
+# newlines to spaces and drops all other control characters
+_TRANSLATE = str.maketrans({
+    **_CONTROL_STRIP,
+    "\t": " ",
+    "\n": " ",
+    **_LIGATURES,
+})
+
+# Patterns used by clean_text() and is_valid_text(), compiled once at import
+_RE_MULTISPACE = re.compile(r" +")
+_RE_HYPHEN_BREAK = re.compile(r"(\w)-\s+(\w)")
+_RE_PUNCT_SPACE = re.compile(r"\s+([,.:;!?)])")
+_RE_OPEN_PAREN = re.compile(r"([(])\s+")
+_RE_IE = re.compile(r"\bi\s*\.\s*e\s*\.")
+_RE_EG = re.compile(r"\be\s*\.\s*g\s*\.")
+_RE_ARTIFACTS = re.compile(
+    r"(?<=\s)(?:ffi|ffl|ff|fi|fl|[bcdefghijklmnopqrstuvwxyz]|[BCDEFGHJKLMNOPQRSTUVWXYZ])(?=\s)"
+    r"|^(?:ffi|ffl|ff|fi|fl|[b-zB-Z])\s+"
+    r"|\s+[b-zB-Z]$"
+)
+_RE_MULTI_PERIOD = re.compile(r"\.\.+")
+_RE_LETTERS = re.compile(r"[a-zA-Z]{2,}")
+_RE_WHITESPACE = re.compile(r"\s+")
+
+
+def extract_highlights(pdf_path: str, jobs: int = 1) -> list[dict]:
     """
     Extract highlighted text from a PDF file.
+    With jobs > 1 the pages are split into contiguous ranges that are
+    processed by that many worker processes.
     Returns a list of dicts with 'page' and 'text' keys.
     """
-    highlights = []
+    if jobs <= 1:
+        return _process_page_range(pdf_path)
+
     doc = fitz.open(pdf_path)
+    page_count = doc.page_count
+    doc.close()
+
+    jobs = min(jobs, page_count)
+    if jobs <= 1:
+        return _process_page_range(pdf_path)
+
+    step = -(-page_count // jobs)  # ceil division
+    ranges = [
+        (pdf_path, start, min(start + step, page_count))
+        for start in range(0, page_count, step)
+    ]
+    with multiprocessing.Pool(len(ranges)) as pool:
+        results = pool.starmap(_process_page_range, ranges)
+
+    # Ranges are contiguous and starmap keeps their order, so the
+    # highlights come back sorted by page
+    return [h for result in results for h in result]
+
 
-    for page_num, page in enumerate(doc, start=1):
-        # Get all text with position info for better extraction
-        text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+def _process_page_range(pdf_path: str, start: int = 0, end: Optional[int] = None) -> list[dict]:
+    """
+    Extract highlights from pages [start, end) of a PDF file (0-based).
+    end=None means up to the last page.
+    """
+    highlights = []
+    doc = fitz.open(pdf_path)
 
-        annotations = page.annots()
-        if annotations is None:
+    for page_num, page in enumerate(doc.pages(start, end), start=start + 1):
+        # Highlight annotation type is 8; read each annotation's rect and
+        # quad points once here, as every property access goes through MuPDF
+        highlight_annots = [
+            (annot.rect, annot.vertices)
+            for annot in page.annots() or []
+            if annot.type[0] == 8
+        ]
+        if not highlight_annots:
             continue
 
-        for annot in annotations:
-            # Highlight annotation type is 8
-            if annot.type[0] == 8:
-                # Get text using multiple methods and pick the best one
-                text = extract_highlight_text(page, annot, text_dict)
+        # Get all text with per-character position info once per page; this
+        # is the expensive part, so only do it for pages that have highlights
+        text_dict = page.get_text("rawdict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+        line_index = build_line_index(text_dict)
 
-                if text:
-                    cleaned = clean_text(text)
-                    if cleaned and is_valid_text(cleaned):
-                        highlights.append({
-                            "page": page_num,
-                            "text": cleaned,
-                        })
+        page_highlights = []
+        for rect, quads in highlight_annots:
+            # Get text using multiple methods and pick the best one
+            text = extract_highlight_text(rect, quads, line_index)
+            if text:
+                add_unique_highlight(page_highlights, text, rect)
+
+        highlights.extend({"page": page_num, "text": text} for text, _ in page_highlights)
 
     doc.close()
     return highlights
 
 
-def extract_highlight_text(page, annot, text_dict) -> str:
-    """Extract text from highlight annotation using multiple methods."""
+def add_unique_highlight(found: list[tuple], text: str, rect):
+    """
+    Add a highlight's (text, rect) to those already found on its page,
+    skipping exact duplicates. If the rects of two highlights overlap (e.g.
+    doubled or overlapping annotations) and one's text contains the other's,
+    only the longer text is kept, at the position of the first one found.
+    """
+    if any(text == kept for kept, _ in found):
+        return
+
+    overlapping = [i for i, (_, kept_rect) in enumerate(found) if rects_overlap(rect, kept_rect)]
+    if any(text in found[i][0] for i in overlapping):
+        return
+
+    contained = [i for i in overlapping if found[i][0] in text]
+    if not contained:
+        found.append((text, rect))
+        return
+
+    found[contained[0]] = (text, rect)
+    for i in reversed(contained[1:]):
+        del found[i]
+
+
+def rects_overlap(a, b) -> bool:
+    """
+    Check if two rects (fitz.Rect or (x0, y0, x1, y1) tuples) overlap by at
+    least half of the smaller one's area. Highlights on adjacent lines touch
+    slightly, so any intersection at all is not enough.
+    """
+    ax0, ay0, ax1, ay1 = a
+    bx0, by0, bx1, by1 = b
+    if ax1 <= bx0 or bx1 <= ax0 or ay1 <= by0 or by1 <= ay0:
+        return False
+
+    overlap = (min(ax1, bx1) - max(ax0, bx0)) * (min(ay1, by1) - max(ay0, by0))
+    smaller = min((ax1 - ax0) * (ay1 - ay0), (bx1 - bx0) * (by1 - by0))
+    return overlap >= 0.5 * smaller
+
+
+def extract_highlight_text(rect, quads, line_index) -> str:
+    """
+    Extract text from a highlight annotation's rect and quad points using
+    multiple methods.
+    Returns the cleaned text of the first method that yields valid text, or "".
+    """
 
     # Method 1: Try to get text from annotation's QuadPoints (most accurate)
-    text = extract_from_quadpoints(page, annot)
-    if text and is_valid_text(clean_text(text)):
+    text = clean_text(extract_from_quadpoints(quads, line_index))
+    if is_valid_text(text):
         return text
 
     # Method 2: Fall back to rect-based extraction
-    rect = annot.rect
-    text = extract_text_from_rect(text_dict, rect)
-    if text and is_valid_text(clean_text(text)):
+    text = clean_text(extract_text_from_rect(line_index, rect))
+    if is_valid_text(text):
         return text
 
-    # Method 3: Simple rect extraction
-    text = page.get_text("text", clip=rect).strip()
-    return text
+    # Method 3: Character-level extraction from the same rect, for highlights
+    # that cover only part of a span
+    text = clean_text(extract_chars_from_rect(line_index, rect))
+    if is_valid_text(text):
+        return text
+
+    return ""
 
 
-def extract_from_quadpoints(page, annot) -> str:
-    """Extract text using annotation's QuadPoints for precise extraction."""
+def extract_from_quadpoints(quads, line_index) -> str:
+    """
+    Extract text using annotation's QuadPoints for precise extraction.
+    quads is the annotation's vertices list (4 corners per highlighted region).
+    """
     try:
-        # Get the quad points (4 corners per highlighted region)
-        quads = annot.vertices
         if not quads:
             return ""
 
         text_parts = []
 
-        # Process quads in groups of 4 points
-        for i in range(0, len(quads), 4):
-            if i + 3 >= len(quads):
-                break
-
+        # Process quads in groups of 4 points; zip drops an incomplete
+        # trailing group
+        points = iter(quads)
+        for (xa, ya), (xb, yb), (xc, yc), (xd, yd) in zip(points, points, points, points):
             # Get bounding rect from quad points
-            points = quads[i:i+4]
-            x_coords = [p[0] for p in points]
-            y_coords = [p[1] for p in points]
-
-            rect = fitz.Rect(
-                min(x_coords),
-                min(y_coords),
-                max(x_coords),
-                max(y_coords)
+            rect = (
+                min(xa, xb, xc, xd),
+                min(ya, yb, yc, yd),
+                max(xa, xb, xc, xd),
+                max(ya, yb, yc, yd),
             )
 
             # Extract text from this rect
-            text = page.get_text("text", clip=rect)
+            text = extract_chars_from_rect(line_index, rect)
             if text:
                 text_parts.append(text.strip())
 
@@ -106,50 +230,125 @@ def extract_from_quadpoints(page, annot) -> str:
         return ""
 
 
-def extract_text_from_rect(text_dict, rect) -> str:
-    """Extract text from text_dict that falls within the given rect."""
+def build_line_index(text_dict) -> tuple:
+    """
+    Index the text lines of a rawdict text_dict by their top edge.
+    Returns (y0s, entries, max_height): entries are (y0, order, line) tuples
+    sorted by y0, y0s is the parallel list of y0 values for bisecting, and
+    max_height is the tallest line's height.
+    Each line is stored as (bbox, spans) with spans as (bbox, chars) tuples,
+    so the dict lookups happen once per page rather than once per highlight.
+    """
+    lines = [
+        (line["bbox"], [(span["bbox"], span["chars"]) for span in line.get("spans", [])])
+        for block in text_dict.get("blocks", [])
+        if block.get("type") == 0  # Only text blocks
+        for line in block.get("lines", [])
+    ]
+    entries = sorted((line[0][1], order, line) for order, line in enumerate(lines))
+    y0s = [entry[0] for entry in entries]
+    max_height = max((bbox[3] - bbox[1] for bbox, _ in lines), default=0.0)
+    return y0s, entries, max_height
+
+
+def candidate_lines(line_index, y0: float, y1: float) -> list:
+    """Return the indexed lines that may overlap [y0, y1], in page order."""
+    y0s, entries, max_height = line_index
+
+    # A line can only reach into the band if its top edge lies between
+    # y0 - max_height and y1
+    lo = bisect_left(y0s, y0 - max_height)
+    hi = bisect_left(y0s, y1)
+    candidates = entries[lo:hi]
+    candidates.sort(key=lambda entry: entry[1])
+    return [entry[2] for entry in candidates]
+
+
+def extract_chars_from_rect(line_index, rect) -> str:
+    """
+    Extract the characters of an indexed page whose centre lies within the
+    given rect. rect may be a fitz.Rect or an (x0, y0, x1, y1) tuple.
+    """
     text_parts = []
+    rx0, ry0, rx1, ry1 = rect
+    if rx0 >= rx1 or ry0 >= ry1:  # Empty rect
+        return ""
 
-    for block in text_dict.get("blocks", []):
-        if block.get("type") != 0:  # Only text blocks
+    for (lx0, ly0, lx1, ly1), spans in candidate_lines(line_index, ry0, ry1):
+        if lx1 <= rx0 or lx0 >= rx1 or ly1 <= ry0 or ly0 >= ry1:
             continue
 
-        for line in block.get("lines", []):
-            line_rect = fitz.Rect(line["bbox"])
-
-            # Check if line intersects with highlight rect
-            if not rect.intersects(line_rect):
+        line_text = []
+        for (sx0, sy0, sx1, sy1), chars in spans:
+            if sx1 <= rx0 or sx0 >= rx1 or sy1 <= ry0 or sy0 >= ry1:
                 continue
 
-            line_text = []
-            for span in line.get("spans", []):
-                span_rect = fitz.Rect(span["bbox"])
+            # Glyph boxes of neighbouring lines overlap a highlight's quads,
+            # so only take characters whose centre is inside the rect
+            for char in chars:
+                cx0, cy0, cx1, cy1 = char["bbox"]
+                cx = (cx0 + cx1) / 2
+                cy = (cy0 + cy1) / 2
+                if rx0 <= cx <= rx1 and ry0 <= cy <= ry1:
+                    line_text.append(char["c"])
 
-                # Check if span is mostly within the highlight rect
-                if is_mostly_within(span_rect, rect, threshold=0.5):
-                    line_text.append(span["text"])
-
-            if line_text:
-                text_parts.append("".join(line_text))
+        if line_text:
+            text_parts.append("".join(line_text))
 
     return " ".join(text_parts)
 
 
-def is_mostly_within(inner: fitz.Rect, outer: fitz.Rect, threshold: float = 0.5) -> bool:
-    """Check if inner rect is mostly within outer rect."""
-    if inner.is_empty or outer.is_empty:
-        return False
+def chars_text(chars) -> str:
+    """Return the text of a rawdict span's chars."""
+    return "".join(char["c"] for char in chars)
 
-    intersection = inner & outer  # Intersection
-    if intersection.is_empty:
-        return False
 
-    inner_area = inner.width * inner.height
-    if inner_area == 0:
-        return False
+def extract_text_from_rect(line_index, rect) -> str:
+    """
+    Extract text from an indexed page that falls within the given rect.
+    rect may be a fitz.Rect or an (x0, y0, x1, y1) tuple.
+    """
+    text_parts = []
+
+    # Compare bboxes as plain tuples rather than building a fitz.Rect per
+    # line and span
+    rx0, ry0, rx1, ry1 = rect
+    if rx0 >= rx1 or ry0 >= ry1:  # Empty rect
+        return ""
+
+    for (lx0, ly0, lx1, ly1), spans in candidate_lines(line_index, ry0, ry1):
+        # Check if line intersects with highlight rect
+        if lx1 <= rx0 or lx0 >= rx1 or ly1 <= ry0 or ly0 >= ry1:
+            continue
+        if lx0 >= lx1 or ly0 >= ly1:
+            continue
+
+        line_text = []
+        for (sx0, sy0, sx1, sy1), chars in spans:
+            if sx0 >= sx1 or sy0 >= sy1:
+                continue
+
+            # Common case: span lies fully inside the highlight rect
+            if sx0 >= rx0 and sy0 >= ry0 and sx1 <= rx1 and sy1 <= ry1:
+                line_text.append(chars_text(chars))
+                continue
 
-    intersection_area = intersection.width * intersection.height
-    return (intersection_area / inner_area) >= threshold
+            # Span entirely outside the highlight rect
+            if sx1 <= rx0 or sx0 >= rx1 or sy1 <= ry0 or sy0 >= ry1:
+                continue
+
+            # Check if span is mostly (>= 50%) within the highlight rect
+            overlap = (
+                (min(sx1, rx1) - max(sx0, rx0))
+                * (min(sy1, ry1) - max(sy0, ry0))
+            )
+            if overlap / ((sx1 - sx0) * (sy1 - sy0)) >= 0.5:
+                line_text.append(chars_text(chars))
+
+        if line_text:
+            text_parts.append("".join(line_text))
+
+    return " ".join(text_parts)
 
 
 def clean_text(text: str) -> str:
@@ -157,64 +356,45 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
 
-    # Replace common PDF ligatures with their expanded forms
-    ligatures = {
-        "\ufb00": "ff",  # ff ligature
-        "\ufb01": "fi",  # fi ligature
-        "\ufb02": "fl",  # fl ligature
-        "\ufb03": "ffi", # ffi ligature
-        "\ufb04": "ffl", # ffl ligature
-        "\ufb05": "st",  # st ligature (long s)
-        "\ufb06": "st",  # st ligature
-    }
-    for lig, replacement in ligatures.items():
-        text = text.replace(lig, replacement)
-
-    # Remove control characters except newline
-    text = "".join(c for c in text if not (ord(c) < 32 and c not in "\n\t "))
-
-    # Normalize different types of whitespace
-    text = text.replace("\t", " ")
-    text = text.replace("\r\n", " ")
-    text = text.replace("\r", " ")
-    text = text.replace("\n", " ")
+    # Expand ligatures, drop control characters and turn tabs/newlines into
+    # spaces in a single pass
+    text = text.translate(_TRANSLATE)
+
+    # The substring checks below are C-level scans that let short, clean
+    # highlights skip regex passes that could not match anyway
 
     # Collapse multiple spaces
-    text = re.sub(r" +", " ", text)
+    if "  " in text:
+        text = _RE_MULTISPACE.sub(" ", text)
 
     # Fix hyphenation at line breaks (word- continuation -> word continuation)
-    text = re.sub(r"(\w)-\s+(\w)", r"\1\2", text)
+    if "-" in text:
+        text = _RE_HYPHEN_BREAK.sub(r"\1\2", text)
 
     # Fix common punctuation spacing issues
-    text = re.sub(r"\s+([,.:;!?)])", r"\1", text)  # Remove space before punctuation
-    text = re.sub(r"([(])\s+", r"\1", text)  # Remove space after opening paren
+    text = _RE_PUNCT_SPACE.sub(r"\1", text)  # Remove space before punctuation
+    if "(" in text:
+        text = _RE_OPEN_PAREN.sub(r"\1", text)  # Remove space after opening paren
 
     # Fix common abbreviations that might have spaces
-    text = re.sub(r"\bi\s*\.\s*e\s*\.", "i.e.", text)
-    text = re.sub(r"\be\s*\.\s*g\s*\.", "e.g.", text)
-
-    # Remove isolated single characters that are likely artifacts from ligatures
-    # Pattern: space + single letter + space (but preserve "a", "A", uppercase "I")
-    # These often come from ligatures (fi, fl, ff) being cut by highlight boundaries
+    if "." in text:
+        text = _RE_IE.sub("i.e.", text)
+        text = _RE_EG.sub("e.g.", text)
+
+    # Remove artifacts left by ligatures being cut by highlight boundaries:
+    # isolated single letters (but preserve "a", "A", uppercase "I") and
+    # ligature fragments (ff, fi, fl, ...) between spaces, plus leading and
+    # trailing single characters or fragments
     # Note: lowercase "i" between words is almost always an artifact, not the pronoun "I"
-    text = re.sub(r"(?<=\s)[bcdefghijklmnopqrstuvwxyz](?=\s)", "", text)
-    text = re.sub(r"(?<=\s)[BCDEFGHJKLMNOPQRSTUVWXYZ](?=\s)", "", text)
-
-    # Remove isolated ligature fragments (ff, fi, fl, etc. surrounded by spaces)
-    text = re.sub(r"(?<=\s)(ff|fi|fl|ffi|ffl)(?=\s)", "", text)
-
-    # Remove leading single characters or ligature fragments at start of text
-    text = re.sub(r"^[bcdefghijklmnopqrstuvwxyz]\s+", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"^(ff|fi|fl|ffi|ffl)\s+", "", text)
-
-    # Remove trailing single characters at end
-    text = re.sub(r"\s+[bcdefghijklmnopqrstuvwxyz]$", "", text, flags=re.IGNORECASE)
+    text = _RE_ARTIFACTS.sub("", text)
 
     # Collapse any resulting multiple spaces again
-    text = re.sub(r" +", " ", text)
+    if "  " in text:
+        text = _RE_MULTISPACE.sub(" ", text)
 
     # Fix double periods
-    text = re.sub(r"\.\.+", ".", text)
+    if ".." in text:
+        text = _RE_MULTI_PERIOD.sub(".", text)
 
     return text.strip()
 
@@ -225,15 +405,15 @@ def is_valid_text(text: str) -> bool:
         return False
 
     # Must contain at least one word with 2+ letters
-    if not re.search(r"[a-zA-Z]{2,}", text):
+    if not _RE_LETTERS.search(text):
         return False
 
     # Calculate ratio of letters to total non-whitespace characters
-    non_space = [c for c in text if not c.isspace()]
+    non_space = _RE_WHITESPACE.sub("", text)
     if not non_space:
         return False
 
-    letters = sum(1 for c in non_space if c.isalpha())
+    letters = sum(map(str.isalpha, non_space))
     ratio = letters / len(non_space)
 
     # At least 40% should be letters
@@ -242,37 +422,42 @@ def is_valid_text(text: str) -> bool:
 
 def save_as_markdown(highlights: list[dict], output_path: str, pdf_name: str):
     """Save highlights to a markdown file."""
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(f"# Highlights from {pdf_name}\n\n")
+    parts = [f"# Highlights from {pdf_name}\n\n"]
+
+    current_page = None
+    for h in highlights:
+        if h["page"] != current_page:
+            current_page = h["page"]
+            parts.append(f"\n## Page {current_page}\n\n")
 
-        current_page = None
-        for h in highlights:
-            if h["page"] != current_page:
-                current_page = h["page"]
-                f.write(f"\n## Page {current_page}\n\n")
+        parts.append(f"> {h['text']}\n\n")
 
-            f.write(f"> {h['text']}\n\n")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
 
 
 def save_as_txt(highlights: list[dict], output_path: str, pdf_name: str):
     """Save highlights to a plain text file."""
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(f"Highlights from {pdf_name}\n")
-        f.write("=" * 50 + "\n\n")
+    parts = [f"Highlights from {pdf_name}\n", "=" * 50 + "\n\n"]
+
+    current_page = None
+    for h in highlights:
+        if h["page"] != current_page:
+            current_page = h["page"]
+            parts.append(f"\n--- Page {current_page} ---\n\n")
 
-        current_page = None
-        for h in highlights:
-            if h["page"] != current_page:
-                current_page = h["page"]
-                f.write(f"\n--- Page {current_page} ---\n\n")
+        parts.append(f"* {h['text']}\n\n")
 
-            f.write(f"* {h['text']}\n\n")
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
 
 
 def save_as_docx(highlights: list[dict], output_path: str, pdf_name: str):
     """Save highlights to a Word document."""
     try:
         from docx import Document
+        from docx.oxml import OxmlElement
+        from docx.oxml.ns import qn
         from docx.shared import Pt
         from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
     except ImportError:
@@ -285,18 +470,96 @@ def save_as_docx(highlights: list[dict], output_path: str, pdf_name: str):
     title = doc.add_heading(f"Highlights from {pdf_name}", level=0)
     title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
 
+    # Quote paragraphs are copied from a prebuilt <w:p> template and inserted
+    # before the body's section properties, which is far cheaper than going
+    # through add_paragraph()/add_run() for every highlight
+    quote = OxmlElement("w:p")
+    quote_pr = OxmlElement("w:pPr")
+    quote_pr.append(OxmlElement("w:pStyle", attrs={qn("w:val"): doc.styles["Quote"].style_id}))
+    quote.append(quote_pr)
+    quote_run = OxmlElement("w:r")
+    quote_run.append(OxmlElement("w:t"))
+    quote.append(quote_run)
+
+    body = doc.element.body
+    insert_paragraph = body.sectPr.addprevious if body.sectPr is not None else body.append
+
     current_page = None
     for h in highlights:
         if h["page"] != current_page:
             current_page = h["page"]
             doc.add_heading(f"Page {current_page}", level=1)
 
-        para = doc.add_paragraph(style="Quote")
-        para.add_run(h["text"])
+        para = deepcopy(quote)
+        para[-1][0].text = h["text"]  # lxml escapes the text
+        insert_paragraph(para)
 
     doc.save(output_path)
 
 
+def save_highlights(highlights: list[dict], output_path: str, pdf_name: str, fmt: str):
+    """Save highlights in the given format (md, txt or docx)."""
+    if fmt == "md":
+        save_as_markdown(highlights, output_path, pdf_name)
+    elif fmt == "txt":
+        save_as_txt(highlights, output_path, pdf_name)
+    elif fmt == "docx":
+        save_as_docx(highlights, output_path, pdf_name)
+
+
+def process_pdf(pdf_path: str, output_path: str, fmt: str) -> int:
+    """
+    Extract highlights from one PDF file and save them, if any were found.
+    Returns the number of highlights. Used as the worker for --batch.
+    """
+    highlights = extract_highlights(pdf_path)
+    if highlights:
+        save_highlights(highlights, output_path, Path(pdf_path).name, fmt)
+    return len(highlights)
+
+
+def run_batch(batch_dir: str, fmt: str, output_dir: str, jobs: int):
+    """Process every PDF file in batch_dir, `jobs` files at a time."""
+    batch_path = Path(batch_dir)
+    if not batch_path.is_dir():
+        print(f"Error: Directory not found: {batch_dir}")
+        sys.exit(1)
+
+    pdf_paths = sorted(p for p in batch_path.iterdir() if p.suffix.lower() == ".pdf")
+    if not pdf_paths:
+        print(f"No PDF files found in: {batch_dir}")
+        sys.exit(0)
+
+    output_root = Path(output_dir or ".")
+    output_root.mkdir(parents=True, exist_ok=True)
+
+    print(f"Extracting highlights from {len(pdf_paths)} PDF file(s) in: {batch_dir}")
+    failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(
+                process_pdf,
+                str(pdf_path),
+                str(output_root / f"{pdf_path.stem}_highlights.{fmt}"),
+                fmt,
+            ): pdf_path
+            for pdf_path in pdf_paths
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            pdf_name = futures[future].name
+            try:
+                count = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"[{done}/{len(futures)}] Error: {pdf_name}: {e}")
+                continue
+            print(f"[{done}/{len(futures)}] {pdf_name}: {count} highlight(s)")
+
+    print(f"Highlights saved to: {output_root}")
+    if failed:
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Extract highlighted text from PDF files",
@@ -306,10 +569,18 @@ Examples:
   python highlight_extractor.py document.pdf -f md
   python highlight_extractor.py document.pdf -f txt -o my_highlights.txt
   python highlight_extractor.py document.pdf -f docx
+  python highlight_extractor.py document.pdf -j 4
+  python highlight_extractor.py --batch papers/ -f md -o notes/
         """
     )
 
-    parser.add_argument("pdf", help="Path to the PDF file")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("pdf", nargs="?", help="Path to the PDF file")
+    source.add_argument(
+        "--batch",
+        metavar="DIR",
+        help="Process every PDF file in DIR, several files at a time (see --jobs)"
+    )
     parser.add_argument(
         "-f", "--format",
         choices=["md", "txt", "docx"],
@@ -318,30 +589,49 @@ Examples:
     )
     parser.add_argument(
         "-o", "--output",
-        help="Output file path. If not specified, uses the PDF name with appropriate extension"
+        help="Output file path (output directory with --batch). "
+             "If not specified, uses the PDF name with appropriate extension"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        help="Number of processes to use: pages of a single PDF, or files with --batch. "
+             "Use 0 for one per CPU core. Default: 1, or one per CPU core with --batch"
     )
 
     args = parser.parse_args()
 
+    if args.jobs is not None and args.jobs < 0:
+        parser.error("argument -j/--jobs: must be 0 or a positive number")
+    if args.jobs is None:
+        args.jobs = 0 if args.batch else 1
+    jobs = args.jobs or os.cpu_count() or 1
+
+    if args.batch:
+        run_batch(args.batch, args.format, args.output, jobs)
+        return
+
     # Validate input file
     pdf_path = Path(args.pdf)
+    pdf_name = pdf_path.name
+    pdf_stem = pdf_path.stem
+    pdf_suffix = pdf_path.suffix.lower()
     if not pdf_path.exists():
         print(f"Error: File not found: {args.pdf}")
         sys.exit(1)
 
-    if not pdf_path.suffix.lower() == ".pdf":
+    if pdf_suffix != ".pdf":
         print("Warning: File does not have .pdf extension")
 
-    # Determine output path
+    # Determine output path; the format names double as file extensions
     if args.output:
         output_path = args.output
     else:
-        ext_map = {"md": ".md", "txt": ".txt", "docx": ".docx"}
-        output_path = pdf_path.stem + "_highlights" + ext_map[args.format]
+        output_path = f"{pdf_stem}_highlights.{args.format}"
 
     # Extract highlights
-    print(f"Extracting highlights from: {pdf_path.name}")
-    highlights = extract_highlights(str(pdf_path))
+    print(f"Extracting highlights from: {pdf_name}")
+    highlights = extract_highlights(str(pdf_path), jobs=jobs)
 
     if not highlights:
         print("No highlights found in the PDF.")
@@ -350,13 +640,7 @@ Examples:
     print(f"Found {len(highlights)} highlight(s)")
 
     # Save to chosen format
-    pdf_name = pdf_path.name
-    if args.format == "md":
-        save_as_markdown(highlights, output_path, pdf_name)
-    elif args.format == "txt":
-        save_as_txt(highlights, output_path, pdf_name)
-    elif args.format == "docx":
-        save_as_docx(highlights, output_path, pdf_name)
+    save_highlights(highlights, output_path, pdf_name, args.format)
 
     print(f"Highlights saved to: {output_path}")
 
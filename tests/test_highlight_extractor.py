@@ -0,0 +1,97 @@
+"""Tests for highlight extraction from PDFs with real highlight annotations."""
+
+import sys
+from pathlib import Path
+
+import fitz
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from highlight_extractor import (  # noqa: E402
+    build_line_index,
+    extract_highlight_text,
+    extract_highlights,
+)
+
+
+LINES = [
+    "Alpha bravo charlie delta echo foxtrot golf hotel india juliet",
+    "Kilo lima mike november oscar papa quebec romeo sierra tango",
+    "uniform victor whiskey xray yankee zulu",
+]
+
+
+def make_pdf(path: Path, phrases: list, lines: list[str] = LINES) -> str:
+    """
+    Write a page of lines (11pt, 13.2pt leading) highlighting each phrase.
+    A phrase may be a (phrase, n) tuple to highlight only its n-th match.
+    """
+    doc = fitz.open()
+    page = doc.new_page()
+    for i, line in enumerate(lines):
+        page.insert_text((72, 100 + i * 13.2), line, fontsize=11)
+    for phrase in phrases:
+        hit = None
+        if isinstance(phrase, tuple):
+            phrase, hit = phrase
+        quads = page.search_for(phrase, quads=True)
+        page.add_highlight_annot(quads if hit is None else [quads[hit]])
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+@pytest.mark.parametrize("phrase", ["mike november oscar", "Alpha bravo", "yankee zulu"])
+def test_highlight_does_not_pull_in_neighbouring_lines(tmp_path, phrase):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", [phrase])
+    assert extract_highlights(pdf_path) == [{"page": 1, "text": phrase}]
+
+
+def page_line_index(pdf_path: str):
+    doc = fitz.open(pdf_path)
+    text_dict = doc[0].get_text("rawdict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+    doc.close()
+    return build_line_index(text_dict)
+
+
+def test_rect_fallback_is_clipped_to_the_highlight(tmp_path):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", [])
+    doc = fitz.open(pdf_path)
+    rect = doc[0].search_for("mike november oscar")[0]
+    doc.close()
+
+    # Without quad points the rect covers less than half of the line's span,
+    # so only the character-level fallback finds the text
+    text = extract_highlight_text(rect, None, page_line_index(pdf_path))
+    assert text == "mike november oscar"
+
+
+def test_empty_rect_yields_no_text(tmp_path):
+    pdf_path = make_pdf(tmp_path / "doc.pdf", [])
+    line_index = page_line_index(pdf_path)
+    assert extract_highlight_text(fitz.Rect(150, 90, 150, 130), None, line_index) == ""
+
+
+def page_texts(pdf_path: str) -> list[str]:
+    return [h["text"] for h in extract_highlights(pdf_path)]
+
+
+def test_doubled_and_overlapping_highlights_are_merged(tmp_path):
+    pdf_path = make_pdf(
+        tmp_path / "doc.pdf",
+        ["Alpha bravo", "mike november", "Alpha bravo", "mike november oscar"],
+    )
+    assert page_texts(pdf_path) == ["Alpha bravo", "mike november oscar"]
+
+
+def test_separate_highlight_repeating_a_word_is_kept(tmp_path):
+    lines = ["Alpha bravo charlie delta", "Kilo lima mike", "zulu bravo echo"]
+    pdf_path = make_pdf(tmp_path / "doc.pdf", ["Alpha bravo charlie", ("bravo", -1)], lines)
+    assert page_texts(pdf_path) == ["Alpha bravo charlie", "bravo"]
+
+
+def test_separate_highlight_inside_another_word_is_kept(tmp_path):
+    lines = ["Start here now", "and then art class"]
+    pdf_path = make_pdf(tmp_path / "doc.pdf", ["Start here now", ("art", -1)], lines)
+    assert page_texts(pdf_path) == ["Start here now", "art"]